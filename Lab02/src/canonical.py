@@ -0,0 +1,201 @@
+import argparse
+import hashlib
+import json
+import os
+
+from isomorphism import OrderedPartition, read_graph_pair
+
+
+class _Orbits:
+    # Union-find over the orbits of the automorphisms found so far
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, v):
+        parent = self.parent
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    def add(self, moved):
+        # moved: pairs (v, image of v) of one automorphism
+        for v, u in moved:
+            a, b = self.find(v), self.find(u)
+            if a != b:
+                self.parent[a] = b
+
+
+def _positional_automorphism(adj, lab_a, lab_b):
+    # The map lab_a[p] -> lab_b[p]; returns its moved pairs if it is an
+    # automorphism. Only edges at moved vertices need checking
+    n = len(lab_a)
+    image = [0] * n
+    for v, u in zip(lab_a, lab_b):
+        image[v] = u
+    moved = [(v, u) for v, u in zip(lab_a, lab_b) if v != u]
+    for v, u in moved:
+        if {image[x] for x in adj[v]} != adj[u]:
+            return None
+    return moved
+
+
+def canonical_labeling(adj):
+    # Individualisation-refinement as in nauty: every leaf of the search tree
+    # is a discrete partition, i.e. a labelling. Leaves are ordered by the
+    # refinement traces along their path and then by certificate, and the
+    # canonical one is the smallest, so a child whose trace already exceeds
+    # the best path is cut off during refinement. adj is a list of neighbour sets.
+    # The first path is built first and its nodes are processed bottom-up.
+    # Every automorphism found below first-path node k fixes the path above k,
+    # so one union-find of orbits serves all levels up to k and prunes sibling
+    # branches there; deeper nodes are left by jumping back when a leaf
+    # matches the first one
+    n = len(adj)
+    if n == 0:
+        return []
+    root = OrderedPartition.by_degree(adj)
+    root.refine(adj, list(root.cells()))
+
+    path = [root]
+    path_traces = []
+    while not path[-1].is_discrete():
+        node = path[-1]
+        s = node.target_cell()
+        child = node.copy()
+        child.individualize(node.lab[s])
+        path_traces.append(child.refine(adj, [s]))
+        path.append(child)
+
+    def certificate(labels):
+        return tuple(sorted(
+            (min(labels[v], labels[u]), max(labels[v], labels[u]))
+            for v in range(n) for u in adj[v] if v < u))
+
+    first = path[-1]
+    first_cert = certificate(first.pos)
+    best, best_traces, best_cert = first, path_traces, first_cert
+    orbits = _Orbits(n)
+
+    for level in range(len(path) - 2, -1, -1):
+        node = path[level]
+        s = node.target_cell()
+        explored = [node.lab[s]]
+        for w in node.lab[s + 1:node.end[s]]:
+            root_w = orbits.find(w)
+            if any(orbits.find(v) == root_w for v in explored):
+                continue
+            explored.append(w)
+
+            # Depth-first over the subtree of w; entries are
+            # [partition, traces on its path, target cell, candidates, next index]
+            stack = [[node, path_traces[:level], s, [w], 0]]
+            while stack:
+                entry = stack[-1]
+                part, traces, t, candidates, i = entry
+                if i == len(candidates):
+                    stack.pop()
+                    continue
+                entry[4] = i + 1
+                depth = len(traces)
+                prefix = best_traces[:depth]
+                if traces > prefix:
+                    stack.pop()
+                    continue
+                bound = best_traces[depth] if traces == prefix and depth < len(best_traces) else None
+                child = part.copy()
+                child.individualize(candidates[i])
+                trace = child.refine(adj, [t], bound=bound)
+                if trace is None:
+                    continue
+                traces = traces + [trace]
+                if depth == level:
+                    # Cheap try: the positional map from the first-path child
+                    # may be an automorphism, then the whole subtree is equivalent
+                    moved = _positional_automorphism(adj, path[level + 1].lab, child.lab)
+                    if moved is not None:
+                        orbits.add(moved)
+                        break
+                if not child.is_discrete():
+                    t = child.target_cell()
+                    stack.append([child, traces, t, child.lab[t:child.end[t]], 0])
+                    continue
+                cert = certificate(child.pos)
+                if cert == first_cert:
+                    # Equivalent to the first leaf: jump back to this level
+                    orbits.add(zip(child.lab, first.lab))
+                    break
+                if cert == best_cert:
+                    orbits.add(zip(child.lab, best.lab))
+                if (traces, cert) < (best_traces, best_cert):
+                    best, best_traces, best_cert = child, traces, cert
+    return best.pos
+
+
+def canonical_form(adj):
+    labels = canonical_labeling(adj)
+    edges = sorted(
+        (min(labels[v], labels[u]), max(labels[v], labels[u]))
+        for v in range(len(adj)) for u in adj[v] if v < u)
+    return len(adj), tuple(edges)
+
+
+def canonical_hash(adj):
+    # Equal for two graphs exactly when they are isomorphic
+    n, edges = canonical_form(adj)
+    data = f"{n};" + ";".join(f"{u},{v}" for u, v in edges)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+class IsomorphismClassCache:
+    # Persistent map canonical hash -> isomorphism class id, stored as JSON
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.classes = {}
+        if os.path.exists(filename):
+            with open(filename, 'r') as f:
+                self.classes = json.load(f)
+
+    def save(self):
+        tmp = self.filename + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.classes, f)
+        os.replace(tmp, self.filename)
+
+    def lookup(self, adj):
+        entry = self.classes.get(canonical_hash(adj))
+        return None if entry is None else entry['id']
+
+    def add(self, adj, name=None):
+        # Returns (class id, True if the class was not seen before)
+        key = canonical_hash(adj)
+        entry = self.classes.get(key)
+        if entry is not None:
+            if name is not None and name not in entry['members']:
+                entry['members'].append(name)
+                self.save()
+            return entry['id'], False
+        class_id = len(self.classes)
+        self.classes[key] = {'id': class_id, 'members': [] if name is None else [name]}
+        self.save()
+        return class_id, True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Canonical graph hashes and isomorphism classes")
+    parser.add_argument('filenames', nargs='*', default=['input.txt'], help='Input files with two graphs')
+    parser.add_argument('--cache', default='isomorphism_classes.json', help='Isomorphism class cache file')
+    args = parser.parse_args()
+
+    cache = IsomorphismClassCache(args.cache)
+    for filename in args.filenames:
+        G1, G2 = read_graph_pair(filename)
+        results = []
+        for index, graph in enumerate((G1, G2), start=1):
+            class_id, new = cache.add(graph, f"{filename}#G{index}")
+            results.append(class_id)
+            print(f"{filename} G{index}: class {class_id}{' (new)' if new else ''}")
+        if results[0] == results[1]:
+            print("Graphs are isomorphic.")
+        else:
+            print("Graphs are not isomorphic.")
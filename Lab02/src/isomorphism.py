@@ -0,0 +1,417 @@
+import argparse
+import heapq
+import time
+from collections import deque
+
+
+def read_graph_pair(filename):
+    # Same format as main.cpp / visual.py: n, then m1 edges of G1, then m2 edges of G2
+    with open(filename, 'r') as f:
+        tokens = f.read().split()
+    pos = 0
+
+    def next_int():
+        nonlocal pos
+        pos += 1
+        return int(tokens[pos - 1])
+
+    n = next_int()
+    graphs = []
+    for _ in range(2):
+        adj = [set() for _ in range(n)]
+        for _ in range(next_int()):
+            u, v = next_int(), next_int()
+            if u != v:
+                adj[u].add(v)
+                adj[v].add(u)
+        graphs.append(adj)
+    return graphs[0], graphs[1]
+
+
+def _color_histogram(colors):
+    histogram = {}
+    for c in colors:
+        histogram[c] = histogram.get(c, 0) + 1
+    return histogram
+
+
+def _search_order(adj, colors):
+    # Rarest colour first, then always the vertex with the most already
+    # ordered neighbours, so that adjacency checks prune as early as possible
+    n = len(adj)
+    class_size = _color_histogram(colors)
+    placed = [False] * n
+    links = [0] * n
+    heap = [(0, class_size[colors[u]], -len(adj[u]), u) for u in range(n)]
+    heapq.heapify(heap)
+    order = []
+    while heap:
+        neg_links, _, _, v = heapq.heappop(heap)
+        if placed[v] or -neg_links != links[v]:
+            continue
+        placed[v] = True
+        order.append(v)
+        for u in adj[v]:
+            if not placed[u]:
+                links[u] += 1
+                heapq.heappush(heap, (-links[u], class_size[colors[u]], -len(adj[u]), u))
+    return order
+
+
+def _component_sizes(adj):
+    n = len(adj)
+    seen = [False] * n
+    sizes = []
+    for start in range(n):
+        if seen[start]:
+            continue
+        seen[start] = True
+        stack = [start]
+        size = 0
+        while stack:
+            v = stack.pop()
+            size += 1
+            for u in adj[v]:
+                if not seen[u]:
+                    seen[u] = True
+                    stack.append(u)
+        sizes.append(size)
+    return sorted(sizes)
+
+
+class OrderedPartition:
+    # Ordered partition of the vertices: lab lists vertices by position,
+    # cell[v] is the start position of v's cell and end[s] the end of the cell
+    # starting at s. Cell positions do not depend on vertex numbering, so
+    # partitions of two graphs can be compared cell by cell
+    def __init__(self, lab, cell, end, num_cells):
+        self.lab = lab
+        self.pos = [0] * len(lab)
+        for p, v in enumerate(lab):
+            self.pos[v] = p
+        self.cell = cell
+        self.end = end
+        self.num_cells = num_cells
+
+    @classmethod
+    def by_degree(cls, adj):
+        n = len(adj)
+        lab = sorted(range(n), key=lambda v: len(adj[v]))
+        cell = [0] * n
+        end = [0] * n
+        num_cells = 0
+        start = 0
+        for p in range(n):
+            if p == 0 or len(adj[lab[p]]) != len(adj[lab[p - 1]]):
+                start = p
+                num_cells += 1
+            cell[lab[p]] = start
+            end[start] = p + 1
+        return cls(lab, cell, end, num_cells)
+
+    def copy(self):
+        other = OrderedPartition.__new__(OrderedPartition)
+        other.lab = list(self.lab)
+        other.pos = list(self.pos)
+        other.cell = list(self.cell)
+        other.end = list(self.end)
+        other.num_cells = self.num_cells
+        return other
+
+    def cells(self):
+        p = 0
+        while p < len(self.lab):
+            yield p
+            p = self.end[p]
+
+    def is_discrete(self):
+        return self.num_cells == len(self.lab)
+
+    def target_cell(self):
+        # Smallest non-singleton cell, the first one on ties
+        best = None
+        for s in self.cells():
+            size = self.end[s] - s
+            if size > 1 and (best is None or size < self.end[best] - best):
+                best = s
+        return best
+
+    def individualize(self, v):
+        # Splits v off the front of its cell; returns the cell start,
+        # which is the only splitter needed if the partition was equitable
+        lab, pos, cell, end = self.lab, self.pos, self.cell, self.end
+        s = cell[v]
+        e = end[s]
+        if e - s == 1:
+            return s
+        p = pos[v]
+        u = lab[s]
+        lab[s], lab[p] = v, u
+        pos[v], pos[u] = s, p
+        end[s] = s + 1
+        end[s + 1] = e
+        for i in range(s + 1, e):
+            cell[lab[i]] = s + 1
+        self.num_cells += 1
+        return s
+
+    def refine(self, adj, splitters, expected=None, bound=None):
+        # Splits cells by the number of neighbours in each splitter cell until
+        # the partition is equitable. Only cells with a neighbour in the
+        # splitter are touched, and of the pieces of a split cell all but the
+        # largest become new splitters (Hopcroft), so one refinement costs
+        # O(m log n). Returns the trace of splits, or None as soon as it
+        # departs from the expected trace of the other graph or becomes
+        # lexicographically greater than bound
+        limit = expected if expected is not None else bound
+        lab, pos, cell, end = self.lab, self.pos, self.cell, self.end
+        n = len(lab)
+        queue = deque(splitters)
+        in_queue = [False] * n
+        for s in splitters:
+            in_queue[s] = True
+        count = [0] * n
+        trace = []
+        while queue:
+            s = queue.popleft()
+            in_queue[s] = False
+            touched = []
+            for i in range(s, end[s]):
+                for u in adj[lab[i]]:
+                    if count[u] == 0:
+                        touched.append(u)
+                    count[u] += 1
+            by_cell = {}
+            for u in touched:
+                by_cell.setdefault(cell[u], []).append(u)
+            for c in sorted(by_cell):
+                members = by_cell[c]
+                e = end[c]
+                zeros = e - c - len(members)
+                members.sort(key=count.__getitem__)
+                groups = [[0, zeros]] if zeros else []
+                for u in members:
+                    if groups and groups[-1][0] == count[u]:
+                        groups[-1][1] += 1
+                    else:
+                        groups.append([count[u], 1])
+                entry = (c, tuple(map(tuple, groups)))
+                if limit is not None and (len(trace) >= len(limit) or limit[len(trace)] != entry):
+                    if expected is not None or len(trace) >= len(limit) or entry > limit[len(trace)]:
+                        for u in touched:
+                            count[u] = 0
+                        return None
+                    # Already smaller than bound, nothing more to compare
+                    limit = None
+                trace.append(entry)
+                if len(groups) == 1:
+                    continue
+
+                # Vertices without neighbours in the splitter stay in front;
+                # swap the others into the tail and sort the tail by count
+                tail = c + zeros
+                front = [pos[u] for u in members if pos[u] < tail]
+                back = [p for p in range(tail, e) if count[lab[p]] == 0]
+                for p, q in zip(front, back):
+                    u, w = lab[p], lab[q]
+                    lab[p], lab[q] = w, u
+                    pos[w], pos[u] = p, q
+                for i, u in enumerate(members, start=tail):
+                    lab[i] = u
+                    pos[u] = i
+
+                starts = []
+                start = c
+                for k, size in groups:
+                    starts.append(start)
+                    end[start] = start + size
+                    if k:
+                        for i in range(start, start + size):
+                            cell[lab[i]] = start
+                    start += size
+                self.num_cells += len(groups) - 1
+                if in_queue[c]:
+                    new = starts[1:]
+                else:
+                    largest = max(range(len(groups)), key=lambda i: groups[i][1])
+                    new = starts[:largest] + starts[largest + 1:]
+                for start in new:
+                    in_queue[start] = True
+                    queue.append(start)
+            for u in touched:
+                count[u] = 0
+        if expected is not None and len(trace) != len(expected):
+            return None
+        return trace
+
+
+def _backtrack(adj1, adj2, colors1, colors2, budget):
+    # Backtracking over colour-preserving maps with in-place undo.
+    # Returns the mapping, None if there is none, or _BUDGET_EXCEEDED
+    n = len(adj1)
+    by_color = {}
+    for w in range(n):
+        by_color.setdefault(colors2[w], []).append(w)
+
+    order = _search_order(adj1, colors1)
+    position = [0] * n
+    for depth, v in enumerate(order):
+        position[v] = depth
+    # Neighbours of order[depth] that are mapped before it
+    earlier = [[u for u in adj1[v] if position[u] < depth] for depth, v in enumerate(order)]
+
+    mapping = [-1] * n
+    used = [False] * n
+    # Number of mapped neighbours; must agree for v and its image
+    mapped_deg1 = [0] * n
+    mapped_deg2 = [0] * n
+    cursor = [0] * n
+    level_candidates = [None] * n
+    depth = 0
+    while depth >= 0:
+        if depth == n:
+            return mapping
+        v = order[depth]
+        if cursor[depth] == 0:
+            # Image of v must be a neighbour of the image of any mapped neighbour
+            if earlier[depth]:
+                color = colors1[v]
+                level_candidates[depth] = sorted(
+                    w for w in adj2[mapping[earlier[depth][0]]] if colors2[w] == color)
+            else:
+                level_candidates[depth] = by_color[colors1[v]]
+        candidates = level_candidates[depth]
+        found = False
+        while cursor[depth] < len(candidates):
+            w = candidates[cursor[depth]]
+            cursor[depth] += 1
+            if used[w]:
+                continue
+            neighbors = adj2[w]
+            if mapped_deg2[w] == mapped_deg1[v] and all(mapping[u] in neighbors for u in earlier[depth]):
+                found = True
+                break
+            # Only rejected candidates count: that is where the search blows up
+            budget -= 1
+            if budget < 0:
+                return _BUDGET_EXCEEDED
+        if found:
+            mapping[v] = w
+            used[w] = True
+            for u in adj1[v]:
+                mapped_deg1[u] += 1
+            for u in adj2[w]:
+                mapped_deg2[u] += 1
+            depth += 1
+            if depth < n:
+                cursor[depth] = 0
+            continue
+        # Undo the mapping of the previous level in place
+        cursor[depth] = 0
+        depth -= 1
+        if depth >= 0:
+            v = order[depth]
+            w = mapping[v]
+            mapping[v] = -1
+            used[w] = False
+            for u in adj1[v]:
+                mapped_deg1[u] -= 1
+            for u in adj2[w]:
+                mapped_deg2[u] -= 1
+    return None
+
+
+_BUDGET_EXCEEDED = object()
+
+
+def _is_isomorphism(adj1, adj2, mapping):
+    return all({mapping[u] for u in adj1[v]} == adj2[mapping[v]] for v in range(len(adj1)))
+
+
+def _individualization_search(adj1, adj2, part1, part2):
+    # Individualisation-refinement on two equitable partitions with equal traces.
+    # The child of part1 is refined once per node and reused for every
+    # candidate in part2, whose refinement stops at the first trace mismatch
+    n = len(adj1)
+    stack = []
+    while True:
+        if part1.is_discrete():
+            mapping = [0] * n
+            for v, w in zip(part1.lab, part2.lab):
+                mapping[v] = w
+            if _is_isomorphism(adj1, adj2, mapping):
+                return mapping
+        else:
+            s = part1.target_cell()
+            child1 = part1.copy()
+            child1.individualize(part1.lab[s])
+            trace = child1.refine(adj1, [s])
+            stack.append([child1, trace, part2, s, part2.lab[s:part2.end[s]], 0])
+
+        while stack:
+            frame = stack[-1]
+            child1, trace, parent2, s, candidates, i = frame
+            child2 = None
+            while i < len(candidates):
+                child2 = parent2.copy()
+                child2.individualize(candidates[i])
+                i += 1
+                if child2.refine(adj2, [s], expected=trace) is not None:
+                    break
+                child2 = None
+            frame[5] = i
+            if child2 is not None:
+                part1, part2 = child1, child2
+                break
+            stack.pop()
+        else:
+            return None
+
+
+def find_isomorphism(adj1, adj2):
+    # Returns mapping[v1] = v2 or None if graphs are not isomorphic
+    n = len(adj1)
+    if n != len(adj2):
+        return None
+    if sum(map(len, adj1)) != sum(map(len, adj2)):
+        return None
+    if sorted(map(len, adj1)) != sorted(map(len, adj2)):
+        return None
+    if _component_sizes(adj1) != _component_sizes(adj2):
+        return None
+    if n == 0:
+        return []
+    part1 = OrderedPartition.by_degree(adj1)
+    part2 = OrderedPartition.by_degree(adj2)
+    trace = part1.refine(adj1, list(part1.cells()))
+    if part2.refine(adj2, list(part2.cells()), expected=trace) is None:
+        return None
+    # Cheap search first; regular and other WL-hard graphs run out of budget
+    # and go to individualisation-refinement
+    result = _backtrack(adj1, adj2, part1.cell, part2.cell, budget=20 * n + 1000)
+    if result is not _BUDGET_EXCEEDED:
+        return result
+    return _individualization_search(adj1, adj2, part1, part2)
+
+
+def is_isomorphic(adj1, adj2):
+    return find_isomorphism(adj1, adj2) is not None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Graph isomorphism check")
+    parser.add_argument('filename', nargs='?', default='input.txt', help='Input file with two graphs')
+    args = parser.parse_args()
+
+    G1, G2 = read_graph_pair(args.filename)
+    start = time.perf_counter()
+    isomorphism = find_isomorphism(G1, G2)
+    elapsed = time.perf_counter() - start
+
+    if isomorphism is None:
+        print("Graphs are not isomorphic.")
+    else:
+        print("Graphs are isomorphic. Isomorphism:")
+        for i, j in enumerate(isomorphism):
+            print(f"{i} -> {j}")
+    print(f"Time: {elapsed * 1000:.3f} ms")
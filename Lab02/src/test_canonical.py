@@ -0,0 +1,60 @@
+import random
+import time
+
+import pytest
+
+from canonical import canonical_hash
+
+
+def complete_graph(n):
+    return [set(range(n)) - {v} for v in range(n)]
+
+
+def empty_graph(n):
+    return [set() for _ in range(n)]
+
+
+def star_graph(n):
+    adj = [{0} for _ in range(n)]
+    adj[0] = set(range(1, n))
+    return adj
+
+
+def cycle_graph(n):
+    return [{(v - 1) % n, (v + 1) % n} for v in range(n)]
+
+
+def relabel(adj, seed):
+    perm = list(range(len(adj)))
+    random.Random(seed).shuffle(perm)
+    relabelled = [set() for _ in adj]
+    for v, neighbors in enumerate(adj):
+        relabelled[perm[v]] = {perm[u] for u in neighbors}
+    return relabelled
+
+
+# Highly symmetric graphs used to take minutes: every leaf of the search
+# tree is an automorphism there. They now take 0.03-0.2 s; the limit only
+# catches a return to the old behaviour, not slow CI machines
+SLOW_LIMIT = 30.0
+
+
+@pytest.mark.parametrize("name, adj", [
+    ("K200", complete_graph(200)),
+    ("empty200", empty_graph(200)),
+    ("star200", star_graph(200)),
+    ("C2000", cycle_graph(2000)),
+])
+def test_symmetric_graphs(name, adj):
+    start = time.perf_counter()
+    h = canonical_hash(adj)
+    elapsed = time.perf_counter() - start
+    assert elapsed < SLOW_LIMIT, f"{name}: {elapsed:.2f} s"
+    assert canonical_hash(relabel(adj, 1)) == h
+
+
+def test_hash_separates_non_isomorphic_graphs():
+    # C6 and two triangles are both 2-regular on 6 vertices
+    two_triangles = [{1, 2}, {0, 2}, {0, 1}, {4, 5}, {3, 5}, {3, 4}]
+    assert canonical_hash(cycle_graph(6)) != canonical_hash(two_triangles)
+    assert canonical_hash(cycle_graph(6)) == canonical_hash(relabel(cycle_graph(6), 2))
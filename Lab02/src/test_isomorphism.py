@@ -0,0 +1,126 @@
+import os
+import random
+
+import pytest
+
+from isomorphism import find_isomorphism, read_graph_pair
+
+HERE = os.path.dirname(__file__)
+
+
+def graph_from_edges(n, edges):
+    adj = [set() for _ in range(n)]
+    for u, v in edges:
+        adj[u].add(v)
+        adj[v].add(u)
+    return adj
+
+
+def cycle_graph(n):
+    return graph_from_edges(n, [(v, (v + 1) % n) for v in range(n)])
+
+
+def complete_graph(n):
+    return [set(range(n)) - {v} for v in range(n)]
+
+
+def rook_graph():
+    # 4x4 rook's graph: same row or same column
+    cells = [(i, j) for i in range(4) for j in range(4)]
+    return graph_from_edges(16, [
+        (a, b) for a in range(16) for b in range(a + 1, 16)
+        if cells[a][0] == cells[b][0] or cells[a][1] == cells[b][1]])
+
+
+def shrikhande_graph():
+    # Z4 x Z4 with steps ±(0,1), ±(1,0), ±(1,1); same parameters srg(16,6,2,2) as the rook's graph
+    steps = {(0, 1), (0, 3), (1, 0), (3, 0), (1, 1), (3, 3)}
+    cells = [(i, j) for i in range(4) for j in range(4)]
+    return graph_from_edges(16, [
+        (a, b) for a in range(16) for b in range(a + 1, 16)
+        if ((cells[b][0] - cells[a][0]) % 4, (cells[b][1] - cells[a][1]) % 4) in steps])
+
+
+def random_regular_graph(degree, n, rng):
+    # Configuration model, retried until the pairing has no loops or multi-edges
+    while True:
+        stubs = [v for v in range(n) for _ in range(degree)]
+        rng.shuffle(stubs)
+        edges = set()
+        for u, v in zip(stubs[::2], stubs[1::2]):
+            if u == v or (min(u, v), max(u, v)) in edges:
+                break
+            edges.add((min(u, v), max(u, v)))
+        else:
+            return graph_from_edges(n, edges)
+
+
+def relabel(adj, seed):
+    perm = list(range(len(adj)))
+    random.Random(seed).shuffle(perm)
+    relabelled = [set() for _ in adj]
+    for v, neighbors in enumerate(adj):
+        relabelled[perm[v]] = {perm[u] for u in neighbors}
+    return relabelled
+
+
+def assert_isomorphism(adj1, adj2, mapping):
+    assert mapping is not None
+    assert sorted(mapping) == list(range(len(adj1)))
+    for v in range(len(adj1)):
+        assert {mapping[u] for u in adj1[v]} == adj2[mapping[v]]
+
+
+@pytest.mark.parametrize("name, adj", [
+    ("K30", complete_graph(30)),
+    ("C100", cycle_graph(100)),
+    ("rook4x4", rook_graph()),
+    ("shrikhande", shrikhande_graph()),
+    ("3-regular 200", random_regular_graph(3, 200, random.Random(1))),
+    ("4-regular 300", random_regular_graph(4, 300, random.Random(2))),
+])
+def test_relabelled_copy_is_isomorphic(name, adj):
+    for seed in range(3):
+        other = relabel(adj, seed)
+        assert_isomorphism(adj, other, find_isomorphism(adj, other))
+
+
+@pytest.mark.parametrize("adj1, adj2", [
+    (rook_graph(), shrikhande_graph()),
+    (cycle_graph(6), graph_from_edges(6, [(0, 1), (1, 2), (2, 0), (3, 4), (4, 5), (5, 3)])),
+    (cycle_graph(500), graph_from_edges(500, [(v, (v + 1) % 250 + 250 * (v // 250)) for v in range(500)])),
+])
+def test_known_non_isomorphic_pairs(adj1, adj2):
+    assert find_isomorphism(adj1, adj2) is None
+    assert find_isomorphism(adj2, adj1) is None
+
+
+def test_random_regular_graphs_match_networkx():
+    nx = pytest.importorskip("networkx")
+    rng = random.Random(3)
+    for _ in range(20):
+        n = rng.choice([10, 12, 14])
+        degree = rng.choice([3, 4])
+        adj1 = random_regular_graph(degree, n, rng)
+        adj2 = random_regular_graph(degree, n, rng)
+        expected = nx.is_isomorphic(
+            nx.Graph([(v, u) for v in range(n) for u in adj1[v]]),
+            nx.Graph([(v, u) for v in range(n) for u in adj2[v]]))
+        mapping = find_isomorphism(adj1, adj2)
+        assert (mapping is not None) == expected
+        if expected:
+            assert_isomorphism(adj1, adj2, mapping)
+
+
+@pytest.mark.parametrize("filename, isomorphic", [
+    ("input.txt", True),
+    ("test_2_svyaz_graph_nesvyaz.txt", False),
+    ("test_3_ideal.txt", True),
+])
+def test_repository_inputs(filename, isomorphic):
+    adj1, adj2 = read_graph_pair(os.path.join(HERE, filename))
+    mapping = find_isomorphism(adj1, adj2)
+    if isomorphic:
+        assert_isomorphism(adj1, adj2, mapping)
+    else:
+        assert mapping is None
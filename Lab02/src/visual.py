@@ -1,5 +1,16 @@
+import argparse
+import hashlib
+import os
+
 import networkx as nx
+import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection
+
+from isomorphism import find_isomorphism
+
+LAYOUTS = ('spring', 'sparse', 'spectral', 'circular', 'random', 'forceatlas2')
+LABEL_LIMIT = 100  # node labels are drawn only for graphs up to this size
 
 def read_graphs(filename):
     with open(filename, 'r') as f:
@@ -10,35 +21,171 @@ def read_graphs(filename):
         for _ in range(m1):
             u, v = map(int, f.readline().split())
             G1.add_edge(u, v)
-        
+
         m2 = int(f.readline().strip())
         G2 = nx.Graph()
         G2.add_nodes_from(range(n))
         for _ in range(m2):
             u, v = map(int, f.readline().split())
             G2.add_edge(u, v)
-        
+
         return G1, G2
 
-def plot_graphs(G1, G2):
-    plt.figure(figsize=(12, 6))
-    
-    plt.subplot(1, 2, 1)
-    pos1 = nx.spring_layout(G1, seed=42)
-    nx.draw(G1, pos1, with_labels=True, node_color='skyblue', 
-            node_size=500, edge_color='gray', font_size=12)
-    plt.title("Graph 1", fontsize=14)
-    
-    plt.subplot(1, 2, 2)
-    pos2 = nx.spring_layout(G2, seed=42)
-    nx.draw(G2, pos2, with_labels=True, node_color='lightgreen', 
-            node_size=500, edge_color='gray', font_size=12)
-    plt.title("Graph 2", fontsize=14)
-    
-    plt.tight_layout()
-    plt.savefig("graph_visualization.png", dpi=300, bbox_inches='tight')
-    plt.show()
+def graph_hash(G):
+    # Hash of the labelled graph: equal node ids and edges give equal positions
+    edges = sorted((min(u, v), max(u, v)) for u, v in G.edges())
+    data = f"{sorted(G.nodes())};{edges}"
+    return hashlib.sha256(data.encode()).hexdigest()
+
+def _bfs_distances(G, source, index):
+    dist = np.full(len(index), -1.0)
+    dist[index[source]] = 0
+    frontier = [source]
+    level = 0
+    while frontier:
+        level += 1
+        next_frontier = []
+        for v in frontier:
+            for u in G[v]:
+                if dist[index[u]] < 0:
+                    dist[index[u]] = level
+                    next_frontier.append(u)
+        frontier = next_frontier
+    return dist
+
+def pivot_mds_layout(G, pivots=50, seed=42):
+    # Pivot MDS: BFS from a few pivots and a 2D projection of the
+    # double-centred n x k distance matrix, O(k (n + m)) instead of O(n^2) per iteration
+    nodes = list(G.nodes())
+    n = len(nodes)
+    if n < 3:
+        return nx.circular_layout(G)
+    index = {v: i for i, v in enumerate(nodes)}
+    rng = np.random.default_rng(seed)
+    k = min(pivots, n)
+    # Farthest-first pivots spread over the whole graph
+    chosen = [nodes[rng.integers(n)]]
+    columns = []
+    nearest = np.full(n, np.inf)
+    for _ in range(k):
+        dist = _bfs_distances(G, chosen[-1], index)
+        # Unreachable vertices (other components) are put just beyond the farthest one
+        dist[dist < 0] = dist.max() + 1
+        columns.append(dist)
+        nearest = np.minimum(nearest, dist)
+        chosen.append(nodes[int(np.argmax(nearest))])
+    squared = np.column_stack(columns) ** 2
+    centred = squared - squared.mean(axis=0) - squared.mean(axis=1, keepdims=True) + squared.mean()
+    u, singular, _ = np.linalg.svd(-0.5 * centred, full_matrices=False)
+    coords = u[:, :2] * singular[:2]
+    coords -= coords.mean(axis=0)
+    scale = np.abs(coords).max()
+    if scale > 0:
+        coords /= scale
+    return dict(zip(nodes, coords))
+
+def compute_layout(G, layout='spring', seed=42, cache_dir=None):
+    # sparse (pivot MDS), circular and random avoid the O(n^2) force iterations
+    # of spring_layout; spectral needs scipy to stay sparse
+    cache_file = None
+    if cache_dir is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        cache_file = os.path.join(cache_dir, f"{graph_hash(G)}_{layout}_{seed}.npz")
+        if os.path.exists(cache_file):
+            with np.load(cache_file) as data:
+                return dict(zip(data['nodes'].tolist(), data['pos']))
+
+    if layout == 'spring':
+        pos = nx.spring_layout(G, seed=seed)
+    elif layout == 'sparse':
+        pos = pivot_mds_layout(G, seed=seed)
+    elif layout == 'spectral':
+        pos = nx.spectral_layout(G)
+    elif layout == 'circular':
+        pos = nx.circular_layout(G)
+    elif layout == 'random':
+        pos = nx.random_layout(G, seed=seed)
+    elif layout == 'forceatlas2':
+        if not hasattr(nx, 'forceatlas2_layout'):
+            raise ValueError("forceatlas2 layout requires networkx >= 3.4")
+        pos = nx.forceatlas2_layout(G, seed=seed)
+    else:
+        raise ValueError(f"Unknown layout: {layout}")
+
+    if cache_file is not None:
+        nodes = list(pos)
+        np.savez(cache_file, nodes=np.array(nodes), pos=np.array([pos[v] for v in nodes]))
+    return pos
+
+def mapped_layout(G1, G2, pos1):
+    # Places every vertex of G2 where its preimage under the isomorphism sits in G1
+    n = G1.number_of_nodes()
+    mapping = find_isomorphism([set(G1[v]) for v in range(n)], [set(G2[v]) for v in range(n)])
+    if mapping is None:
+        return None
+    return {mapping[v]: pos1[v] for v in range(n)}
+
+def draw_graph(ax, G, pos, node_color):
+    # All edges go into one LineCollection instead of one artist per edge
+    nodes = list(G.nodes())
+    xy = np.array([pos[v] for v in nodes]) if nodes else np.empty((0, 2))
+    index = {v: i for i, v in enumerate(nodes)}
+    edges = np.array([(index[u], index[v]) for u, v in G.edges()], dtype=np.int64).reshape(-1, 2)
+    segments = xy[edges]
+    small = len(nodes) <= LABEL_LIMIT
+    ax.add_collection(LineCollection(segments, colors='gray', linewidths=1.0 if small else 0.3,
+                                     alpha=1.0 if small else 0.3, zorder=1))
+    ax.scatter(xy[:, 0], xy[:, 1], s=500 if small else max(1.0, 2000 / len(nodes)),
+               c=node_color, zorder=2)
+    if small:
+        for v, (x, y) in zip(nodes, xy):
+            ax.text(x, y, str(v), fontsize=12, ha='center', va='center', zorder=3)
+    ax.autoscale()
+    ax.set_axis_off()
+
+def plot_graphs(G1, G2, layout='spring', reuse_layout=False, cache_dir=None,
+                output="graph_visualization.png", figsize=(12, 6), dpi=300, show=True):
+    pos1 = compute_layout(G1, layout, cache_dir=cache_dir)
+    pos2 = mapped_layout(G1, G2, pos1) if reuse_layout else None
+    if pos2 is None:
+        pos2 = compute_layout(G2, layout, cache_dir=cache_dir)
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=figsize)
+    draw_graph(ax1, G1, pos1, 'skyblue')
+    ax1.set_title("Graph 1", fontsize=14)
+    draw_graph(ax2, G2, pos2, 'lightgreen')
+    ax2.set_title("Graph 2", fontsize=14)
+
+    fig.tight_layout()
+    if output:
+        fig.savefig(output, dpi=dpi, bbox_inches='tight')
+    if show:
+        plt.show()
+    plt.close(fig)
 
 if __name__ == "__main__":
-    G1, G2 = read_graphs("input.txt")
-    plot_graphs(G1, G2)
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Draw two graphs side by side")
+    parser.add_argument('filenames', nargs='*', default=['input.txt'], help='Input files with two graphs')
+    parser.add_argument('--layout', choices=LAYOUTS, default='spring', help='Layout algorithm')
+    parser.add_argument('--reuse-layout', action='store_true',
+                        help='Place G2 by an isomorphism to G1 when one exists')
+    parser.add_argument('--layout-cache', default=None, help='Directory for cached layouts')
+    parser.add_argument('--headless', action='store_true', help='Only save images, never open a window')
+    parser.add_argument('--output', default='graph_visualization.png',
+                        help='Output image; with several inputs the input name is appended')
+    parser.add_argument('--width', type=float, default=12, help='Figure width in inches')
+    parser.add_argument('--height', type=float, default=6, help='Figure height in inches')
+    parser.add_argument('--dpi', type=int, default=300, help='Output resolution')
+    args = parser.parse_args()
+
+    if args.headless:
+        plt.switch_backend('Agg')
+    for filename in args.filenames:
+        output = args.output
+        if len(args.filenames) > 1:
+            base, ext = os.path.splitext(args.output)
+            output = f"{base}_{os.path.splitext(os.path.basename(filename))[0]}{ext}"
+        G1, G2 = read_graphs(filename)
+        plot_graphs(G1, G2, layout=args.layout, reuse_layout=args.reuse_layout,
+                    cache_dir=args.layout_cache, output=output,
+                    figsize=(args.width, args.height), dpi=args.dpi, show=not args.headless)
@@ -1,5 +1,9 @@
 from collections import defaultdict, deque
+from array import array
 import argparse
+import csv
+import json
+import os
 import openpyxl
 import sys
 
@@ -91,20 +95,108 @@ class Graph:
                 return color_map
         return None
 
-    def load_tree_from_excel(self, filename: str):
-        wb = openpyxl.load_workbook(filename)
-        sheet = wb.active
-        nodes = set()
-        edges = []
-        for row in sheet.iter_rows(min_row=2, values_only=True):
-            u, v = row
-            nodes.update([u, v])
-            edges.append((u, v))
-        for node in nodes:
-            self.add_node(node)
+    def add_edges_from(self, edges) -> None:
+        # Массовое добавление рёбер без вызова add_edge на каждое ребро
+        graph = self.graph
         for u, v in edges:
-            self.add_edge(u, v)
+            graph[u].add(v)
+            graph[v].add(u)
+
+    def load_tree_from_excel(self, filename: str):
+        # read_only открывает книгу потоково, без построения всех ячеек в памяти
+        wb = openpyxl.load_workbook(filename, read_only=True, data_only=True)
+        try:
+            sheet = wb.active
+            self.add_edges_from(
+                (row[0], row[1])
+                for row in sheet.iter_rows(min_row=2, max_col=2, values_only=True)
+                if row[0] is not None and row[1] is not None)
+        finally:
+            wb.close()
+
+    def load_tree_from_csv(self, filename: str):
+        with open(filename, newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)  # заголовок
+            self.add_edges_from((row[0], row[1]) for row in reader if len(row) >= 2)
+
+    def load_tree_from_binary(self, filename: str):
+        # .npy — массив формы (m, 2), иначе — упакованные пары int32
+        if filename.endswith('.npy'):
+            import numpy as np
+            pairs = np.load(filename).astype(np.int64, copy=False).reshape(-1, 2)
+            self.add_edges_from(pairs.tolist())
+            return
+        data = array('i')
+        with open(filename, 'rb') as f:
+            data.frombytes(f.read())
+        if len(data) % 2:
+            raise ValueError(f"Нечётное количество чисел в файле {filename}")
+        self.add_edges_from(zip(data[::2], data[1::2]))
+
+    @staticmethod
+    def _read_cache(cache_file: str, key):
+        # Кэш — только данные (JSON), поэтому чужой файл не может выполнить код.
+        # Любая ошибка чтения или несовпадение ключа — промах кэша
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('key') != list(key):
+                return None
+            nodes = data['nodes']
+            graph = {}
+            for node, neighbors in zip(nodes, data['adjacency']):
+                graph[node] = {nodes[i] for i in neighbors}
+            return graph
+        except (OSError, ValueError, TypeError, KeyError, IndexError, AttributeError):
+            return None
+
+    @staticmethod
+    def _write_cache(cache_file: str, key, graph) -> None:
+        # Узлы хранятся списком, рёбра — номерами узлов в этом списке
+        nodes = list(graph)
+        index = {node: i for i, node in enumerate(nodes)}
+        data = {'key': list(key), 'nodes': nodes,
+                'adjacency': [sorted(index[u] for u in graph[node]) for node in nodes]}
+        tmp = cache_file + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp, cache_file)
+        except (OSError, TypeError, ValueError):
+            # Например, каталог только для чтения: граф уже загружен, кэш не обязателен
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
 
+    def load_from_file(self, filename: str, use_cache: bool = True):
+        # Разобранный граф кэшируется рядом с файлом; ключ — mtime и размер файла
+        stat = os.stat(filename)
+        key = (stat.st_mtime_ns, stat.st_size)
+        cache_file = filename + '.cache.json'
+        if use_cache:
+            graph = self._read_cache(cache_file, key)
+            if graph is not None:
+                for node, neighbors in graph.items():
+                    self.graph[node].update(neighbors)
+                return
+
+        extension = os.path.splitext(filename)[1].lower()
+        loaded = Graph()
+        if extension in ('.xlsx', '.xlsm'):
+            loaded.load_tree_from_excel(filename)
+        elif extension == '.csv':
+            loaded.load_tree_from_csv(filename)
+        elif extension in ('.npy', '.bin'):
+            loaded.load_tree_from_binary(filename)
+        else:
+            raise ValueError(f"Неизвестный формат файла: {filename}")
+
+        if use_cache:
+            self._write_cache(cache_file, key, loaded.graph)
+        for node, neighbors in loaded.graph.items():
+            self.graph[node].update(neighbors)
 
 def main():
     parser = argparse.ArgumentParser(description="Хроматическое число графа")
@@ -120,17 +212,29 @@ def main():
         help='Загрузить граф из Excel файла, например: graph.xlsx',
         default='graph.xlsx',
         required=False)
+    graph_group.add_argument(
+        '--load',
+        help='Загрузить граф из файла (.xlsx, .csv, .npy или .bin с парами int32), например: graph.csv',
+        required=False)
+    graph_group.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Не использовать кэш разобранного графа')
     args = parser.parse_args()
     g = Graph()
     with RedirectPrint('output.txt'):
         if args.edges:
             print("Загрузка графа из рёбер.")
-            for node in args.nodes:
+            nodes = args.nodes or []
+            for node in nodes:
                 g.add_node(node)
-            for i in range(0, len(args.edges), 2):
-                g.add_edge(args.edges[i], args.edges[i + 1])
+            g.add_edges_from(zip(args.edges[0::2], args.edges[1::2]))
             print(
-                f"Граф загружен с {len(args.nodes)} узлами и {len(args.edges) // 2} рёбрами.")
+                f"Граф загружен с {len(g.graph)} узлами и {len(args.edges) // 2} рёбрами.")
+        elif args.load:
+            print(f"Загрузка графа из файла {args.load}.")
+            g.load_from_file(args.load, use_cache=not args.no_cache)
+            print(f"Граф успешно загружен: {len(g.graph)} узлов.")
         elif args.excel_load:
             print(f"Загрузка графа из файла {args.excel_load}.")
             g.load_tree_from_excel(args.excel_load)
@@ -1,39 +1,86 @@
+from multiprocessing import Pool, shared_memory
+import argparse
+import csv
+import heapq
+import math
+import numpy as np
 import openpyxl
 import os
-import random
+import sys
+import time
 
-def generate_random_graphs(num_nodes, num_edges, filename = "input_graph.xlsx"):
-    if os.path.exists(filename):
-        os.remove(filename)
+NO_PATH = -1  # значение next_node, если пути нет
+RESULT_PREFIX = "apsp_result"  # файлы результата: <префикс>_dist.npy, _next.npy, _nodes.txt
+PARALLEL_MIN_NODES = 1000  # на меньших графах запуск пула процессов дороже самого расчёта
+PRINT_MAX_NODES = 20  # матрицы и пути выводятся в консоль только для графов не больше этого
 
-    workbook = openpyxl.Workbook()
-    sheet = workbook.active
-    # nodes = [str(i) for i in range(num_nodes)]
-    nodes = [chr(ord("A")+i) for i in range(num_nodes)]
-    edges = {}
+def node_names(num_nodes):
+    # Буквы, пока их хватает, иначе номера
+    if num_nodes <= 26:
+        return [chr(ord("A")+i) for i in range(num_nodes)]
+    return [str(i) for i in range(num_nodes)]
 
-    while len(edges) < num_edges:
-        from_node = random.choice(nodes)
-        to_node = random.choice(nodes)
-        if from_node != to_node: 
-            weight = random.randint(1, 10)
-            edges[from_node, to_node] = weight
-    
-    sheet.cell(row=1, column=1, value=num_nodes) 
-    sheet.cell(row=1, column=2, value=num_edges) 
+def sample_edges(num_nodes, num_edges, seed=None, weight_range=(1, 10), distribution="uniform"):
+    # Выборка без повторений индексов из пространства n(n-1) упорядоченных пар,
+    # индекс k -> (u, v): u = k // (n-1), v = k % (n-1) со сдвигом через диагональ
+    rng = np.random.default_rng(seed)
+    num_pairs = num_nodes * (num_nodes - 1)
+    num_edges = max(min(num_edges, num_pairs), 0)
+    index = rng.choice(num_pairs, size=num_edges, replace=False) if num_edges else np.empty(0, dtype=np.int64)
+    from_node = index // max(num_nodes - 1, 1)
+    to_node = index % max(num_nodes - 1, 1)
+    to_node += to_node >= from_node
 
-    for row, edge in enumerate(edges.items()): 
-        (from_node, to_node), weight = edge
-        sheet.cell(row=row+2, column=1, value=from_node) 
-        sheet.cell(row=row+2, column=2, value=to_node) 
-        sheet.cell(row=row+2, column=3, value=weight) 
+    low, high = weight_range
+    if distribution == "uniform":
+        weight = rng.integers(low, high + 1, size=num_edges)
+    elif distribution == "normal":
+        weight = np.rint(rng.normal((low + high) / 2, (high - low) / 6, size=num_edges))
+        weight = np.clip(weight, low, high).astype(np.int64)
+    else:
+        raise ValueError(f"Неизвестное распределение весов: {distribution}")
+    return from_node, to_node, weight
 
-    for row, node in enumerate(nodes):
-        sheet.cell(row=row + 2, column=5, value=node)
+def generate_random_graphs(num_nodes, num_edges, filename = "input_graph.xlsx", seed=None,
+                           weight_range=(1, 10), distribution="uniform", chunk_size=100000):
+    # Формат выбирается по расширению: .xlsx (потоковая книга), .csv или .npz
+    if os.path.exists(filename):
+        os.remove(filename)
 
-    workbook.save(filename)
+    from_node, to_node, weight = sample_edges(num_nodes, num_edges, seed, weight_range, distribution)
+    num_edges = len(weight)
+    nodes = node_names(num_nodes)
+    extension = os.path.splitext(filename)[1].lower()
 
-def read_graph_from_excel(file_path):
+    if extension == ".npz":
+        np.savez(filename, num_nodes=num_nodes, from_node=from_node.astype(np.int32),
+                 to_node=to_node.astype(np.int32), weight=weight)
+    elif extension == ".csv":
+        names = np.array(nodes, dtype=object)
+        with open(filename, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow([num_nodes, num_edges])
+            for start in range(0, num_edges, chunk_size):
+                stop = start + chunk_size
+                writer.writerows(zip(names[from_node[start:stop]], names[to_node[start:stop]],
+                                     weight[start:stop].tolist()))
+    else:
+        # Та же раскладка, что и раньше: рёбра в столбцах A–C, список узлов в столбце E
+        workbook = openpyxl.Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        sheet.append([num_nodes, num_edges])
+        for start in range(0, max(num_edges, num_nodes), chunk_size):
+            stop = start + chunk_size
+            edge_rows = zip([nodes[i] for i in from_node[start:stop].tolist()],
+                            [nodes[i] for i in to_node[start:stop].tolist()],
+                            weight[start:stop].tolist())
+            for row, edge in enumerate(edge_rows, start=start):
+                sheet.append([*edge, None, nodes[row] if row < num_nodes else None])
+            for row in range(max(start, num_edges), min(stop, num_nodes)):
+                sheet.append([None, None, None, None, nodes[row]])
+        workbook.save(filename)
+
+def read_edges_from_excel(file_path):
     workbook = openpyxl.load_workbook(file_path)
     sheet = workbook.active
 
@@ -41,7 +88,7 @@ def read_graph_from_excel(file_path):
     num_nodes = sheet.cell(row=1, column=1).value
     num_edges = sheet.cell(row=1, column=2).value
 
-    for row in range(2, num_edges + 1):
+    for row in range(2, num_edges + 2):
         from_node = sheet.cell(row=row, column=1).value
         to_node = sheet.cell(row=row, column=2).value
         weight = sheet.cell(row=row, column=3).value
@@ -54,6 +101,11 @@ def read_graph_from_excel(file_path):
         nodes[node] = row
 
     workbook.close()
+    return edges, nodes
+
+def read_graph_from_excel(file_path):
+    edges, nodes = read_edges_from_excel(file_path)
+    num_nodes = len(nodes)
     graph = [[float('inf')] * num_nodes for _ in range(num_nodes)]
 
     for i in range(num_nodes):
@@ -63,6 +115,45 @@ def read_graph_from_excel(file_path):
 
     return graph, list(nodes.keys())
 
+def read_adjacency_from_excel(file_path):
+    # Список смежности: adjacency[u] = [(v, вес), ...], без плотной матрицы n×n
+    edges, nodes = read_edges_from_excel(file_path)
+    adjacency = [[] for _ in range(len(nodes))]
+    for (from_node, to_node), weight in edges.items():
+        adjacency[nodes[from_node]].append((nodes[to_node], weight))
+    return adjacency, list(nodes.keys())
+
+def read_adjacency(file_path):
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension == ".npz":
+        with np.load(file_path) as data:
+            nodes = node_names(int(data["num_nodes"]))
+            edges = zip(data["from_node"].tolist(), data["to_node"].tolist(), data["weight"].tolist())
+            adjacency = [[] for _ in nodes]
+            for from_node, to_node, weight in edges:
+                adjacency[from_node].append((to_node, weight))
+        return adjacency, nodes
+    if extension == ".csv":
+        with open(file_path, newline="") as f:
+            reader = csv.reader(f)
+            num_nodes, _ = map(int, next(reader))
+            nodes = node_names(num_nodes)
+            index = {node: i for i, node in enumerate(nodes)}
+            adjacency = [[] for _ in nodes]
+            for from_node, to_node, weight in reader:
+                adjacency[index[from_node]].append((index[to_node], float(weight)))
+        return adjacency, nodes
+    return read_adjacency_from_excel(file_path)
+
+def adjacency_to_matrix(adjacency):
+    num_nodes = len(adjacency)
+    graph = np.full((num_nodes, num_nodes), np.inf)
+    np.fill_diagonal(graph, 0)
+    for u, neighbors in enumerate(adjacency):
+        for v, weight in neighbors:
+            graph[u, v] = min(graph[u, v], weight)
+    return graph
+
 def floyd_warshall_with_path(graph):
     num_vertices = len(graph)
     dist = [row[:] for row in graph]
@@ -77,49 +168,431 @@ def floyd_warshall_with_path(graph):
 
     return dist, next_node
 
+def floyd_warshall_numpy(graph, dtype=np.float64):
+    # Каждый шаг k — одна векторная операция над всей матрицей вместо двух циклов по i, j.
+    # next_node хранится как int32, отсутствие пути — NO_PATH
+    dist = np.array(graph, dtype=dtype)
+    num_vertices = dist.shape[0]
+    next_node = np.broadcast_to(np.arange(num_vertices, dtype=np.int32), dist.shape).copy()
+    next_node[np.isinf(dist)] = NO_PATH
+    np.fill_diagonal(next_node, np.arange(num_vertices, dtype=np.int32))
+
+    through_k = np.empty_like(dist)
+    better = np.empty(dist.shape, dtype=bool)
+    for k in range(num_vertices):
+        column = dist[:, k, None].copy()
+        row = dist[None, k, :].copy()
+        np.add(column, row, out=through_k)
+        np.less(through_k, dist, out=better)
+        np.copyto(dist, through_k, where=better)
+        np.copyto(next_node, next_node[:, k, None], where=better)
+
+    return dist, next_node
+
+def _fw_tile(dist, next_node, rows, cols, ks):
+    # Релаксация плитки dist[rows, cols] через вершины ks (по одной k за шаг)
+    tile = dist[rows, cols]
+    tile_next = next_node[rows, cols]
+    for k in range(ks.start, ks.stop):
+        through_k = dist[rows, k, None] + dist[None, k, cols]
+        better = through_k < tile
+        np.copyto(tile, through_k, where=better)
+        np.copyto(tile_next, next_node[rows, k, None], where=better)
+
+_shared_matrices = None
+
+def _init_tile_worker(dist_name, next_name, shape):
+    global _shared_matrices
+    dist_shm = shared_memory.SharedMemory(name=dist_name)
+    next_shm = shared_memory.SharedMemory(name=next_name)
+    dist = np.ndarray(shape, dtype=np.float64, buffer=dist_shm.buf)
+    next_node = np.ndarray(shape, dtype=np.int32, buffer=next_shm.buf)
+    _shared_matrices = (dist_shm, next_shm, dist, next_node)
+
+def _tile_worker(tile):
+    _, _, dist, next_node = _shared_matrices
+    rows, cols, ks = tile
+    _fw_tile(dist, next_node, rows, cols, ks)
+
+def choose_block_size(num_vertices, processes=None):
+    # Последовательно — плитки по 256; параллельно — столько блоков, чтобы в фазе 3
+    # было не меньше четырёх плиток на процесс, но плитки не мельче 64 вершин
+    if processes is None or processes <= 1:
+        return max(1, min(256, num_vertices))
+    num_blocks = math.isqrt(4 * processes - 1) + 2
+    return max(1, min(512, max(64, -(-num_vertices // num_blocks))))
+
+def blocked_floyd_warshall(graph, block_size=None, processes=None):
+    # Блочный Флойд–Уоршелл: для каждого диагонального блока kb
+    # фаза 1 — сам блок (kb, kb), фаза 2 — строка и столбец блоков kb,
+    # фаза 3 — все остальные блоки, независимые друг от друга.
+    # При processes > 1 фазы 2 и 3 считаются в пуле процессов над общей памятью
+    graph = np.asarray(graph, dtype=np.float64)
+    num_vertices = graph.shape[0]
+    if block_size is None:
+        block_size = choose_block_size(num_vertices, processes)
+    num_blocks = max(1, -(-num_vertices // block_size))
+    size = num_blocks * block_size
+    blocks = [slice(b * block_size, (b + 1) * block_size) for b in range(num_blocks)]
+
+    parallel = processes is not None and processes > 1 and num_blocks > 1
+    if parallel:
+        dist_shm = shared_memory.SharedMemory(create=True, size=size * size * 8)
+        next_shm = shared_memory.SharedMemory(create=True, size=size * size * 4)
+        dist = np.ndarray((size, size), dtype=np.float64, buffer=dist_shm.buf)
+        next_node = np.ndarray((size, size), dtype=np.int32, buffer=next_shm.buf)
+    else:
+        dist = np.empty((size, size), dtype=np.float64)
+        next_node = np.empty((size, size), dtype=np.int32)
+
+    # Дополнительные вершины изолированы и не влияют на результат
+    dist.fill(np.inf)
+    dist[:num_vertices, :num_vertices] = graph
+    np.fill_diagonal(dist, 0)
+    next_node[:] = np.arange(size, dtype=np.int32)
+    next_node[np.isinf(dist)] = NO_PATH
+
+    pool = None
+    try:
+        if parallel:
+            pool = Pool(processes, initializer=_init_tile_worker,
+                        initargs=(dist_shm.name, next_shm.name, (size, size)))
+        for kb, ks in enumerate(blocks):
+            _fw_tile(dist, next_node, ks, ks, ks)
+
+            # Каждая задача — одна плитка; chunksize даёт по несколько порций на процесс
+            phase2 = [(ks, blocks[b], ks) for b in range(num_blocks) if b != kb]
+            phase2 += [(blocks[b], ks, ks) for b in range(num_blocks) if b != kb]
+            phase3 = [(blocks[i], blocks[j], ks)
+                      for i in range(num_blocks) if i != kb
+                      for j in range(num_blocks) if j != kb]
+            for tiles in (phase2, phase3):
+                if pool is not None:
+                    pool.map(_tile_worker, tiles, chunksize=max(1, len(tiles) // (processes * 4)))
+                else:
+                    for rows, cols, k_slice in tiles:
+                        _fw_tile(dist, next_node, rows, cols, k_slice)
+
+        result = (dist[:num_vertices, :num_vertices].copy(),
+                  next_node[:num_vertices, :num_vertices].copy())
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        if parallel:
+            del dist, next_node
+            dist_shm.close()
+            dist_shm.unlink()
+            next_shm.close()
+            next_shm.unlink()
+    return result
+
 def reconstruct_path(next_node, start, end):
-    if next_node[start][end] is None:
+    step = next_node[start][end]
+    if step is None or step == NO_PATH:
         return [] 
     path = []
     while start != end:
         path.append(start)
-        start = next_node[start][end]
+        start = int(next_node[start][end])
     path.append(end)
     return path
 
-def write_result_to_excel(dist, nodes, next_node, filename='graph.xlsx'):
-    wb = openpyxl.Workbook()
-    
-    ws_dist = wb.active
-    ws_dist.title = "Distances"
-
-    ws_dist.cell(row=1, column=1, value='из\\до')
-    for col, node in enumerate(nodes, start=2):
-        ws_dist.cell(row=1, column=col, value=node)
-
-    for i in range(len(dist)):
-        ws_dist.cell(row=i + 2, column=1, value=nodes[i])
-        for j in range(len(dist[i])):
-            ws_dist.cell(row=i + 2, column=j + 2, value=dist[i][j])  
-
-    ws_paths = wb.create_sheet(title="Paths")
-
-    ws_paths.cell(row=1, column=1, value='Из')
-    ws_paths.cell(row=1, column=2, value='До')
-    ws_paths.cell(row=1, column=3, value='Путь')
-
-    row = 2
-    for i in range(len(nodes)):
-        for j in range(len(nodes)):
-            if i != j:
-                path = reconstruct_path(next_node, i, j)
-                ws_paths.cell(row=row, column=1, value=nodes[i]) 
-                ws_paths.cell(row=row, column=2, value=nodes[j]) 
-                ws_paths.cell(row=row, column=3, value=' -> '.join(nodes[k] for k in path)) 
-                row += 1
+def dijkstra_with_path(adjacency, source):
+    # Возвращает строку расстояний и строку next_node для одного источника.
+    # next_node[v] — первая вершина после source на кратчайшем пути в v
+    num_nodes = len(adjacency)
+    dist = [float('inf')] * num_nodes
+    first_hop = [NO_PATH] * num_nodes
+    dist[source] = 0
+    first_hop[source] = source
+    heap = [(0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, weight in adjacency[u]:
+            new_dist = d + weight
+            if new_dist < dist[v]:
+                dist[v] = new_dist
+                first_hop[v] = v if u == source else first_hop[u]
+                heapq.heappush(heap, (new_dist, v))
+    return dist, first_hop
+
+def bellman_ford_potentials(adjacency):
+    # Потенциалы Джонсона: расстояния от фиктивной вершины, соединённой со всеми рёбрами веса 0
+    num_nodes = len(adjacency)
+    potential = [0] * num_nodes
+    for _ in range(num_nodes):
+        changed = False
+        for u, neighbors in enumerate(adjacency):
+            for v, weight in neighbors:
+                if potential[u] + weight < potential[v]:
+                    potential[v] = potential[u] + weight
+                    changed = True
+        if not changed:
+            return potential
+    raise ValueError("Граф содержит цикл отрицательного веса")
+
+_pool_adjacency = None
+
+def _init_dijkstra_worker(adjacency):
+    global _pool_adjacency
+    _pool_adjacency = adjacency
+
+def _dijkstra_worker(source):
+    return dijkstra_with_path(_pool_adjacency, source)
+
+def johnson_rows(adjacency, sources, processes=None):
+    # Дейкстра из вершин sources; при отрицательных весах — перевзвешивание Джонсона.
+    # processes > 1 запускает источники в пуле процессов
+    num_nodes = len(adjacency)
+    sources = list(sources)
+    has_negative = any(weight < 0 for neighbors in adjacency for _, weight in neighbors)
+    if has_negative:
+        potential = bellman_ford_potentials(adjacency)
+        search_adjacency = [
+            [(v, weight + potential[u] - potential[v]) for v, weight in neighbors]
+            for u, neighbors in enumerate(adjacency)]
+    else:
+        potential = None
+        search_adjacency = adjacency
+
+    if processes is not None and processes > 1 and len(sources) > 1:
+        chunksize = max(1, len(sources) // (processes * 4))
+        with Pool(processes, initializer=_init_dijkstra_worker, initargs=(search_adjacency,)) as pool:
+            rows = pool.map(_dijkstra_worker, sources, chunksize=chunksize)
+    else:
+        rows = [dijkstra_with_path(search_adjacency, source) for source in sources]
+
+    dist = np.array([row for row, _ in rows], dtype=np.float64).reshape(len(sources), num_nodes)
+    next_node = np.array([hops for _, hops in rows], dtype=np.int32).reshape(len(sources), num_nodes)
+    if potential is not None:
+        potential = np.array(potential, dtype=np.float64)
+        dist += potential[None, :] - potential[sources, None]
+    return dist, next_node
+
+def johnson_with_path(adjacency, processes=None):
+    return johnson_rows(adjacency, range(len(adjacency)), processes=processes)
+
+def decrease_edge(dist, next_node, u, v, weight):
+    # Ребро u -> v стало дешевле (или добавлено): любой улучшенный путь i ~> j
+    # теперь идёт как i ~> u -> v ~> j, поэтому хватает одного прохода O(n²)
+    if weight + dist[v, u] < 0:
+        raise ValueError("Граф содержит цикл отрицательного веса")
+    through_edge = dist[:, u, None] + weight + dist[None, v, :]
+    better = through_edge < dist
+    if not better.any():
+        return
+    hop = next_node[:, u].copy()
+    hop[u] = v
+    np.copyto(dist, through_edge, where=better)
+    np.copyto(next_node, hop[:, None], where=better)
+
+def update_edge(adjacency, dist, next_node, u, v, weight=None, processes=None):
+    # Меняет вес ребра u -> v в adjacency (weight=None — удаление) и чинит dist/next_node на месте.
+    # Уменьшение веса и добавление — O(n²); при увеличении и удалении пересчитываются
+    # только строки источников, у которых ребро лежало на кратчайшем пути
+    # Проверка до изменения adjacency, чтобы при ошибке граф и матрицы остались согласованными
+    if weight is not None and weight + dist[v, u] < 0:
+        raise ValueError("Граф содержит цикл отрицательного веса")
+    old_weight = min((w for to, w in adjacency[u] if to == v), default=None)
+    adjacency[u] = [(to, w) for to, w in adjacency[u] if to != v]
+    if weight is not None:
+        adjacency[u].append((v, weight))
+
+    if old_weight is None or (weight is not None and weight <= old_weight):
+        if weight is not None:
+            decrease_edge(dist, next_node, u, v, weight)
+        return
+
+    through_edge = dist[:, u, None] + old_weight + dist[None, v, :]
+    used = np.isfinite(dist) & np.isclose(through_edge, dist, rtol=1e-12, atol=0)
+    sources = np.flatnonzero(used.any(axis=1))
+    if sources.size == 0:
+        return
+    rows_dist, rows_next = johnson_rows(adjacency, sources.tolist(), processes=processes)
+    dist[sources] = rows_dist
+    next_node[sources] = rows_next
+
+def all_pairs_shortest_paths(adjacency, density_threshold=0.1, processes=None):
+    # Для разреженных графов Джонсон/Дейкстра: O(n·m·log n) вместо Θ(n³)
+    num_nodes = len(adjacency)
+    num_edges = sum(len(neighbors) for neighbors in adjacency)
+    density = num_edges / (num_nodes * (num_nodes - 1)) if num_nodes > 1 else 1.0
+    if density >= density_threshold:
+        if processes is not None and processes > 1:
+            return blocked_floyd_warshall(adjacency_to_matrix(adjacency), processes=processes)
+        return floyd_warshall_numpy(adjacency_to_matrix(adjacency))
+    return johnson_with_path(adjacency, processes=processes)
+
+def random_dense_graph(num_nodes, density=0.5, seed=None):
+    rng = np.random.default_rng(seed)
+    graph = rng.integers(1, 11, size=(num_nodes, num_nodes)).astype(np.float64)
+    graph[rng.random((num_nodes, num_nodes)) >= density] = np.inf
+    np.fill_diagonal(graph, 0)
+    return graph
+
+def benchmark_floyd_warshall(sizes=(500, 1000, 2000), python_limit=500, dtype=np.float64):
+    # Чистый Python на больших n работает часами, поэтому для n > python_limit
+    # его время оценивается по кубической зависимости от последнего замера
+    python_time = None
+    python_size = None
+    print("n\tPython, с\tNumPy, с\tускорение")
+    for n in sizes:
+        graph = random_dense_graph(n, seed=n)
+
+        start = time.perf_counter()
+        dist_np, _ = floyd_warshall_numpy(graph, dtype=dtype)
+        numpy_time = time.perf_counter() - start
+
+        if n <= python_limit:
+            graph_list = graph.tolist()
+            start = time.perf_counter()
+            dist_py, _ = floyd_warshall_with_path(graph_list)
+            python_time = time.perf_counter() - start
+            python_size = n
+            assert np.allclose(dist_np, np.array(dist_py))
+            estimated = python_time
+            mark = ""
+        elif python_time is not None:
+            estimated = python_time * (n / python_size) ** 3
+            mark = "~"
+        else:
+            print(f"{n}\t-\t{numpy_time:.3f}\t-")
+            continue
+        print(f"{n}\t{mark}{estimated:.3f}\t{numpy_time:.3f}\t{mark}{estimated / numpy_time:.1f}x")
+
+def save_result(dist, next_node, nodes, prefix=RESULT_PREFIX):
+    np.save(prefix + "_dist.npy", np.asarray(dist, dtype=np.float64))
+    np.save(prefix + "_next.npy", np.asarray(next_node, dtype=np.int32))
+    with open(prefix + "_nodes.txt", "w", encoding="utf-8") as f:
+        f.write("\n".join(str(node) for node in nodes))
+
+def load_result(prefix=RESULT_PREFIX, mmap=True):
+    # С mmap=True матрицы не читаются в память целиком — подгружаются только нужные строки
+    mmap_mode = 'r' if mmap else None
+    dist = np.load(prefix + "_dist.npy", mmap_mode=mmap_mode)
+    next_node = np.load(prefix + "_next.npy", mmap_mode=mmap_mode)
+    with open(prefix + "_nodes.txt", encoding="utf-8") as f:
+        nodes = f.read().split("\n")
+    return dist, next_node, nodes
+
+def _node_indices(nodes, *names):
+    index = {node: i for i, node in enumerate(nodes)}
+    for name in names:
+        if name not in index:
+            raise ValueError(f"Неизвестный узел: {name}")
+    return [index[name] for name in names]
+
+def query_distance(dist, nodes, src, dst):
+    i, j = _node_indices(nodes, src, dst)
+    return float(dist[i, j])
+
+def query_path(next_node, nodes, src, dst):
+    i, j = _node_indices(nodes, src, dst)
+    return [nodes[k] for k in reconstruct_path(next_node, i, j)]
+
+class ExportProgress:
+    # Печатает число выгруженных строк и скорость выгрузки
+    def __init__(self, title, total, enabled=True):
+        self.title = title
+        self.total = total
+        self.enabled = enabled
+        self.done = 0
+        self.started = time.perf_counter()
+
+    def advance(self, rows):
+        self.done += rows
+        if self.enabled:
+            elapsed = max(time.perf_counter() - self.started, 1e-9)
+            print(f"\r{self.title}: {self.done}/{self.total} строк, {self.done / elapsed:.0f} строк/с",
+                  end="", flush=True)
+
+    def finish(self):
+        if self.enabled:
+            print()
+
+def iter_distance_chunks(dist, nodes, chunk_size=256):
+    # Строки матрицы расстояний блоками: из numpy/mmap читается по chunk_size строк за раз
+    for start in range(0, len(nodes), chunk_size):
+        block = np.asarray(dist[start:start + chunk_size], dtype=np.float64).tolist()
+        yield [[nodes[start + i], *values] for i, values in enumerate(block)]
+
+def iter_path_chunks(next_node, nodes, chunk_size=256):
+    for start in range(0, len(nodes), chunk_size):
+        rows = []
+        for i in range(start, min(start + chunk_size, len(nodes))):
+            for j in range(len(nodes)):
+                if i != j:
+                    path = reconstruct_path(next_node, i, j)
+                    rows.append([nodes[i], nodes[j], ' -> '.join(nodes[k] for k in path)])
+        yield rows
+
+def write_result_to_excel(dist, nodes, next_node, filename='graph.xlsx', include_paths=False,
+                          chunk_size=256, progress=True):
+    # write_only-книга дописывает строки в файл, не создавая объект на каждую ячейку
+    wb = openpyxl.Workbook(write_only=True)
+
+    ws_dist = wb.create_sheet(title="Distances")
+    ws_dist.append(['из\\до', *nodes])
+    report = ExportProgress("Distances", len(nodes), progress)
+    for rows in iter_distance_chunks(dist, nodes, chunk_size):
+        for row in rows:
+            ws_dist.append(row)
+        report.advance(len(rows))
+    report.finish()
+
+    if include_paths:
+        ws_paths = wb.create_sheet(title="Paths")
+        ws_paths.append(['Из', 'До', 'Путь'])
+        report = ExportProgress("Paths", len(nodes) * (len(nodes) - 1), progress)
+        for rows in iter_path_chunks(next_node, nodes, chunk_size):
+            for row in rows:
+                ws_paths.append(row)
+            report.advance(len(rows))
+        report.finish()
 
     wb.save(filename)
 
+def write_result_to_csv(dist, nodes, next_node, filename, include_paths=False,
+                        chunk_size=256, progress=True):
+    # Пути (если нужны) пишутся в отдельный файл <имя>_paths.csv
+    with open(filename, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(['из\\до', *nodes])
+        report = ExportProgress("Distances", len(nodes), progress)
+        for rows in iter_distance_chunks(dist, nodes, chunk_size):
+            writer.writerows(rows)
+            report.advance(len(rows))
+        report.finish()
+
+    if include_paths:
+        paths_file = os.path.splitext(filename)[0] + "_paths.csv"
+        with open(paths_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(['Из', 'До', 'Путь'])
+            report = ExportProgress("Paths", len(nodes) * (len(nodes) - 1), progress)
+            for rows in iter_path_chunks(next_node, nodes, chunk_size):
+                writer.writerows(rows)
+                report.advance(len(rows))
+            report.finish()
+
+def export_result(dist, nodes, next_node, filename, include_paths=False, chunk_size=256, progress=True):
+    # Формат по расширению: .xlsx, .csv или .npy. Для .npy имя без расширения —
+    # префикс save_result, сам файл с этим именем не создаётся.
+    # Возвращает список записанных файлов
+    stem, extension = os.path.splitext(filename)
+    extension = extension.lower()
+    if extension == ".csv":
+        write_result_to_csv(dist, nodes, next_node, filename, include_paths, chunk_size, progress)
+    elif extension == ".npy":
+        save_result(dist, next_node, nodes, prefix=stem)
+        return [stem + "_dist.npy", stem + "_next.npy", stem + "_nodes.txt"]
+    else:
+        write_result_to_excel(dist, nodes, next_node, filename, include_paths, chunk_size, progress)
+    return [filename]
+
 def print_graph(dist, nodes):
     n = len(dist)
     for i in range(n):
@@ -136,7 +609,7 @@ def print_graph(dist, nodes):
     print()
 
 def main():
-    print("Выберите режим работы \n1. Сгенерировать рандомный граф с указанным количеством графов и путей \n2. Провести вычисления созданного графа !!!Внимание ответ будет записан в excel файл \n ")
+    print("Выберите режим работы \n1. Сгенерировать рандомный граф с указанным количеством графов и путей \n2. Провести вычисления созданного графа !!!Внимание ответ будет записан в excel файл \n3. Сравнить скорость Флойда–Уоршелла (Python и NumPy) \n4. Найти путь и расстояние между двумя узлами по сохранённому результату \n ")
     choose = int(input())
 
     if choose == 1:
@@ -144,27 +617,84 @@ def main():
         num_nodes = max(int(input()), 1)
         print("Введите количество ветвей")
         num_edges = max(min(int(input()), num_nodes**2-num_nodes), 0)
-        generate_random_graphs(num_nodes, num_edges)
+        print("Введите имя файла (.xlsx, .csv или .npz; пусто — input_graph.xlsx)")
+        filename = input().strip() or "input_graph.xlsx"
+        print("Введите seed (пусто — случайный)")
+        seed = input().strip()
+        generate_random_graphs(num_nodes, num_edges, filename, seed=int(seed) if seed else None)
+    elif choose == 3:
+        benchmark_floyd_warshall()
+    elif choose == 4:
+        try:
+            dist, next_node, nodes = load_result()
+        except OSError:
+            print("Нет сохранённого результата, сначала запустите режим 2")
+            return
+        print("Введите начальный узел")
+        src = input().strip()
+        print("Введите конечный узел")
+        dst = input().strip()
+        try:
+            print(f"Расстояние из {src} в {dst}:", query_distance(dist, nodes, src, dst))
+            print(f"Путь из {src} в {dst}:", ' -> '.join(query_path(next_node, nodes, src, dst)))
+        except ValueError as error:
+            print(error)
     else:
-        input_file = "input_graph.xlsx"
-        output_file = "output_distances_and_paths.xlsx"
-        graph, nodes = read_graph_from_excel(input_file)
-        print("изначальный граф:")
-        print_graph(graph, nodes)
-        dist, next_node = floyd_warshall_with_path(graph)
-        print("Граф минимальных расстояний:")
-        print_graph(dist, nodes)
-        for i in range(len(nodes)):
-            for j in range(len(nodes)):
-                if i != j:
-                    path = reconstruct_path(next_node, i, j)
-                    print(f"Путь из {nodes[i]} в {nodes[j]}:", path)
-        write_result_to_excel(dist, nodes, next_node, output_file)
-        print("Результаты сохранены в", output_file)
+        print("Введите имя файла графа (пусто — input_graph.xlsx)")
+        input_file = input().strip() or "input_graph.xlsx"
+        print("Введите имя файла результата (.xlsx, .csv или .npy; пусто — output_distances_and_paths.xlsx)\n"
+              "Для .npy имя задаёт префикс: записываются <имя>_dist.npy, <имя>_next.npy и <имя>_nodes.txt")
+        output_file = input().strip() or "output_distances_and_paths.xlsx"
+        adjacency, nodes = read_adjacency(input_file)
+        small = len(nodes) <= PRINT_MAX_NODES
+        if small:
+            print("изначальный граф:")
+            print_graph(adjacency_to_matrix(adjacency), nodes)
+        else:
+            print(f"Граф из {len(nodes)} узлов, матрицы в консоль не выводятся")
+        processes = os.cpu_count() if len(adjacency) >= PARALLEL_MIN_NODES else None
+        dist, next_node = all_pairs_shortest_paths(adjacency, processes=processes)
+        save_result(dist, next_node, nodes)
+        print("Матрицы расстояний и переходов сохранены в", RESULT_PREFIX + "_*.npy")
+        if small:
+            print("Граф минимальных расстояний:")
+            print_graph(dist, nodes)
+        print("Выгрузить все пути? (1 — да, иначе нет)")
+        include_paths = input().strip() == "1"
+        if include_paths and small:
+            for i in range(len(nodes)):
+                for j in range(len(nodes)):
+                    if i != j:
+                        path = reconstruct_path(next_node, i, j)
+                        print(f"Путь из {nodes[i]} в {nodes[j]}:", path)
+        written = export_result(dist, nodes, next_node, output_file, include_paths=include_paths)
+        print("Результаты сохранены в", ", ".join(written))
 
-# Вызов функции main
+def query_main(argv):
+    parser = argparse.ArgumentParser(description="Запросы к сохранённому результату кратчайших путей")
+    parser.add_argument('command', choices=['path', 'dist'], help='path — путь, dist — расстояние')
+    parser.add_argument('src', help='Начальный узел')
+    parser.add_argument('dst', help='Конечный узел')
+    parser.add_argument('--result', default=RESULT_PREFIX, help='Префикс файлов результата')
+    args = parser.parse_args(argv)
+    try:
+        dist, next_node, nodes = load_result(args.result)
+    except OSError:
+        parser.error(f"нет сохранённого результата {args.result}_*; сначала запустите режим 2")
+    try:
+        if args.command == 'dist':
+            print(query_distance(dist, nodes, args.src, args.dst))
+        else:
+            print(' -> '.join(query_path(next_node, nodes, args.src, args.dst)))
+    except ValueError as error:
+        parser.error(str(error))
+
+# Вызов функции main; с аргументами командной строки — режим запросов (path/dist)
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) > 1:
+        query_main(sys.argv[1:])
+    else:
+        main()
 
 
 
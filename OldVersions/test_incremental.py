@@ -0,0 +1,89 @@
+import importlib.util
+import os
+import random
+
+import numpy as np
+import pytest
+
+# Имя модуля содержит пробелы, поэтому он загружается по пути к файлу
+_spec = importlib.util.spec_from_file_location(
+    "laba2_var6", os.path.join(os.path.dirname(__file__), "laba 2_var 6.py"))
+laba = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(laba)
+
+
+def random_adjacency(rng, num_nodes, num_edges, negative_edges=0):
+    adjacency = [[] for _ in range(num_nodes)]
+    seen = set()
+    for _ in range(num_edges):
+        u, v = rng.sample(range(num_nodes), 2)
+        if (u, v) not in seen:
+            seen.add((u, v))
+            adjacency[u].append((v, rng.randint(1, 10)))
+    # Отрицательные рёбра только вперёд по номерам, так что циклов отрицательного веса нет
+    for _ in range(negative_edges):
+        u, v = sorted(rng.sample(range(num_nodes), 2))
+        if (u, v) not in seen:
+            seen.add((u, v))
+            adjacency[u].append((v, -2))
+    return adjacency
+
+
+def has_negative_cycle(adjacency):
+    try:
+        laba.bellman_ford_potentials(adjacency)
+    except ValueError:
+        return True
+    return False
+
+
+def assert_matches_recomputation(adjacency, dist, next_node):
+    expected, _ = laba.johnson_with_path(adjacency)
+    assert np.allclose(dist, expected)
+    expected_fw, _ = laba.floyd_warshall_numpy(laba.adjacency_to_matrix(adjacency))
+    assert np.allclose(dist, expected_fw)
+
+    matrix = laba.adjacency_to_matrix(adjacency)
+    for i in range(len(adjacency)):
+        for j in range(len(adjacency)):
+            path = laba.reconstruct_path(next_node, i, j)
+            if np.isinf(expected[i, j]):
+                assert path == []
+            else:
+                assert path[0] == i and path[-1] == j
+                assert np.isclose(sum(matrix[a, b] for a, b in zip(path, path[1:])), expected[i, j])
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_random_updates_match_full_recomputation(seed):
+    rng = random.Random(seed)
+    num_nodes = rng.randint(2, 20)
+    adjacency = random_adjacency(rng, num_nodes, 3 * num_nodes, negative_edges=3 if seed % 3 == 0 else 0)
+    dist, next_node = laba.johnson_with_path(adjacency)
+
+    for _ in range(20):
+        u, v = rng.sample(range(num_nodes), 2)
+        old = [w for to, w in adjacency[u] if to == v]
+        # Уменьшение, добавление, увеличение или удаление ребра
+        if old:
+            weight = rng.choice([None, old[0] - rng.randint(1, 3), old[0] + rng.randint(1, 5)])
+        else:
+            weight = rng.randint(-1, 10)
+        candidate = [list(neighbors) for neighbors in adjacency]
+        candidate[u] = [(to, w) for to, w in candidate[u] if to != v]
+        if weight is not None:
+            candidate[u].append((v, weight))
+        if has_negative_cycle(candidate):
+            continue
+        laba.update_edge(adjacency, dist, next_node, u, v, weight)
+        assert_matches_recomputation(adjacency, dist, next_node)
+
+
+def test_negative_cycle_leaves_graph_unchanged():
+    adjacency = [[(1, 1)], []]
+    dist, next_node = laba.johnson_with_path(adjacency)
+    with pytest.raises(ValueError):
+        laba.update_edge(adjacency, dist, next_node, 1, 0, -5.0)
+    assert adjacency == [[(1, 1)], []]
+    laba.update_edge(adjacency, dist, next_node, 1, 0, 2)
+    assert_matches_recomputation(adjacency, dist, next_node)